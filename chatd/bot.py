@@ -6,9 +6,14 @@ This module handles Discord interactions and event handling.
 
 import asyncio
 import heapq
+import logging
+import socket
+import time
+from collections import Counter
 from datetime import datetime
 from typing import Dict, List, Any, Set, Optional, Tuple
 
+import aiohttp
 import discord
 from discord.ext import commands
 import schedule
@@ -28,12 +33,69 @@ intents.message_content = True
 intents.reactions = config.enable_reactions  # Enable reaction intents only if reactions are enabled
 bot = commands.Bot(command_prefix='!', intents=intents)
 
+# Reactions added to each posted message
+REACTIONS: Tuple[str, ...] = ('❓', '✅')
+
 # Bot state
 failed_channels: Set[str] = set()  # Keep track of channels that have failed
-channel_failure_counts: Dict[str, int] = {}  # Track failure counts for each channel
+failed_channel_times: Dict[str, float] = {}  # When each failed channel was marked failed (monotonic)
+channel_failure_counts: Counter = Counter()  # Track failure counts for each channel
+
+
+def _mark_channel_failed(channel_id: str) -> None:
+    """
+    Stop sending to a channel until its failure retry period has passed.
+    
+    Args:
+        channel_id: The Discord channel ID
+    """
+    failed_channels.add(channel_id)
+    failed_channel_times[channel_id] = time.monotonic()
+
+
+def _is_channel_failed(channel_id: str) -> bool:
+    """
+    Check whether a channel is currently marked as failed.
+    
+    Channels are given another chance once config.failed_channel_retry_minutes
+    have passed since they were marked failed.
+    
+    Args:
+        channel_id: The Discord channel ID
+        
+    Returns:
+        bool: True if sends to the channel should be skipped, False otherwise
+    """
+    if channel_id not in failed_channels:
+        return False
+    
+    now = time.monotonic()
+    failed_at = failed_channel_times.setdefault(channel_id, now)
+    if now - failed_at < config.failed_channel_retry_minutes * 60:
+        return True
+    
+    logger.info(f"Retrying channel {channel_id} after {config.failed_channel_retry_minutes} minutes")
+    failed_channels.discard(channel_id)
+    del failed_channel_times[channel_id]
+    channel_failure_counts.pop(channel_id, None)
+    return False
 
 
-async def send_message(message: str, channel_id: str, role_key: Optional[str] = None) -> Optional[discord.Message]:
+def _record_channel_failure(channel_id: str) -> None:
+    """
+    Count a failed send and stop using the channel once it reaches max retries.
+    
+    Args:
+        channel_id: The Discord channel ID
+    """
+    channel_failure_counts[channel_id] += 1
+    if channel_failure_counts[channel_id] >= config.max_retries:
+        logger.warning(f"Channel {channel_id} has failed {config.max_retries} times, adding to failed channels")
+        _mark_channel_failed(channel_id)
+
+
+async def send_message(message: str, channel_id: str, role_key: Optional[str] = None,
+                       defer_tracking: bool = False) -> Optional[discord.Message]:
     """
     Send a message to a Discord channel with error handling and retry mechanism.
     
@@ -41,37 +103,40 @@ async def send_message(message: str, channel_id: str, role_key: Optional[str] =
         message: The message content to send
         channel_id: The Discord channel ID
         role_key: Optional role key for tracking messages
+        defer_tracking: If True, leave saving the message info to the caller
         
     Returns:
         Optional[discord.Message]: The sent message if successful, None otherwise
     """
-    if channel_id in failed_channels:
+    if _is_channel_failed(channel_id):
         logger.debug(f"Skipping previously failed channel ID {channel_id}")
         return None
 
     try:
         logger.debug(f"Sending message to channel ID {channel_id}...")
-        channel = bot.get_channel(int(channel_id))
+        channel_id_int = int(channel_id)
+        channel = bot.get_channel(channel_id_int)
         
-        if channel is None:
+        if channel is None and not config.enable_reactions:
+            # Sending only needs the channel ID, so skip the fetch round trip;
+            # a missing channel or permission error surfaces from send() instead
+            logger.debug(f"Channel {channel_id} not in cache, sending by ID...")
+            channel = bot.get_partial_messageable(channel_id_int)
+        elif channel is None:
             logger.debug(f"Channel {channel_id} not in cache, attempting to fetch...")
             try:
-                channel = await bot.fetch_channel(int(channel_id))
+                channel = await bot.fetch_channel(channel_id_int)
             except discord.NotFound:
                 logger.warning(f"Channel {channel_id} not found")
-                channel_failure_counts[channel_id] = channel_failure_counts.get(channel_id, 0) + 1
-                if channel_failure_counts[channel_id] >= config.max_retries:
-                    failed_channels.add(channel_id)
+                _record_channel_failure(channel_id)
                 return None
             except discord.Forbidden:
                 logger.error(f"No permission for channel {channel_id}")
-                failed_channels.add(channel_id)  # Immediate blacklist on permission issues
+                _mark_channel_failed(channel_id)  # Immediate blacklist on permission issues
                 return None
             except Exception as e:
                 logger.error(f"Error fetching channel {channel_id}: {e}")
-                channel_failure_counts[channel_id] = channel_failure_counts.get(channel_id, 0) + 1
-                if channel_failure_counts[channel_id] >= config.max_retries:
-                    failed_channels.add(channel_id)
+                _record_channel_failure(channel_id)
                 return None
 
         sent_message = await channel.send(message)
@@ -82,25 +147,25 @@ async def send_message(message: str, channel_id: str, role_key: Optional[str] =
             await add_reactions_to_message(sent_message)
         
         # Store message info if we have a role key
-        if role_key:
+        if role_key and not defer_tracking:
             storage = get_storage('file', 
                                 data_file=config.data_file, 
                                 messages_file=config.messages_file)
             storage.save_message_info(str(sent_message.id), channel_id, role_key)
         
         # Reset failure count on success
-        if channel_id in channel_failure_counts:
-            del channel_failure_counts[channel_id]
+        channel_failure_counts.pop(channel_id, None)
         
         await asyncio.sleep(1)  # Rate limiting delay
         return sent_message
         
+    except discord.Forbidden:
+        logger.error(f"No permission for channel {channel_id}")
+        _mark_channel_failed(channel_id)  # Immediate blacklist on permission issues
+        return None
     except Exception as e:
         logger.error(f"Error sending message to channel {channel_id}: {e}")
-        channel_failure_counts[channel_id] = channel_failure_counts.get(channel_id, 0) + 1
-        if channel_failure_counts[channel_id] >= config.max_retries:
-            logger.warning(f"Channel {channel_id} has failed {config.max_retries} times, adding to failed channels")
-            failed_channels.add(channel_id)
+        _record_channel_failure(channel_id)
         return None
 
 
@@ -111,13 +176,10 @@ async def add_reactions_to_message(message: discord.Message) -> None:
     Args:
         message: The Discord message to add reactions to
     """
-    # Define reactions to add
-    reactions = ['❓', '✅']
-    
-    for reaction in reactions:
+    # Add reactions one at a time so they appear in order; discord.py handles the rate limit
+    for reaction in REACTIONS:
         try:
             await message.add_reaction(reaction)
-            await asyncio.sleep(0.5)  # Add a small delay between reactions
         except Exception as e:
             logger.warning(f"Failed to add reaction {reaction} to message {message.id}: {e}")
 
@@ -133,16 +195,32 @@ async def send_messages_to_channels(message: str, role_key: Optional[str] = None
     Returns:
         List[discord.Message]: List of successfully sent messages
     """
-    tasks = []
-    for channel_id in config.channel_ids:
-        if channel_id not in failed_channels:
-            tasks.append(send_message(message, channel_id, role_key))
+    channel_ids = [channel_id for channel_id in config.channel_ids if not _is_channel_failed(channel_id)]
+    
+    # Bound how many channels are sent to at once so large channel lists don't trip rate limits
+    semaphore = asyncio.Semaphore(config.send_concurrency)
+    
+    async def send_with_limit(channel_id: str) -> Optional[discord.Message]:
+        async with semaphore:
+            return await send_message(message, channel_id, role_key, defer_tracking=True)
     
-    # Wait for all messages to be sent
+    tasks = [send_with_limit(channel_id) for channel_id in channel_ids]
+    
+    # Wait for all messages to be sent. gather(return_exceptions=True) is used rather
+    # than a TaskGroup so one failing channel doesn't cancel the sends to the others
     results = await asyncio.gather(*tasks, return_exceptions=True)
     
     # Filter out None and exceptions
-    return [msg for msg in results if isinstance(msg, discord.Message)]
+    sent = [(channel_id, msg) for channel_id, msg in zip(channel_ids, results) if isinstance(msg, discord.Message)]
+    
+    # Store message info for all channels in a single write
+    if role_key and sent:
+        storage = get_storage('file', 
+                            data_file=config.data_file, 
+                            messages_file=config.messages_file)
+        storage.save_message_info_many([(str(msg.id), channel_id, role_key) for channel_id, msg in sent])
+    
+    return [msg for _, msg in sent]
 
 
 async def check_for_new_roles() -> None:
@@ -164,56 +242,72 @@ async def check_for_new_roles() -> None:
         logger.debug("No updates to listings file, skipping check.")
         return
         
-    new_data = read_json()
+    # Parse the listings file off the event loop so reactions and sends stay responsive
+    new_data = await loop.run_in_executor(None, read_json)
     
     # Get storage and load previous data
     storage = get_storage('file', 
                         data_file=config.data_file, 
                         messages_file=config.messages_file)
-    old_data = storage.load_data()
+    # Use the stored ID index for quick lookup of old roles (loaded off the event loop)
+    old_roles_dict = await loop.run_in_executor(None, storage.get_roles_by_id)
     
-    if old_data:
+    if old_roles_dict:
         logger.debug("Previous data loaded.")
     else:
         logger.debug("No previous data found.")
 
     # Initialize a priority queue for new roles
     new_roles_heap = []
-    
-    # Create a dictionary for quick lookup of old roles using role IDs
-    old_roles_dict = { role['id']: role for role in old_data }
+    skipped_old_count = 0
+    log_each_role = logger.isEnabledFor(logging.DEBUG)
+
+    # Compute the posting age window once for the whole check
+    now = datetime.now().timestamp()
+    max_age_seconds = config.max_post_age_days * 24 * 60 * 60
 
     for new_role in new_data:
-        old_role = old_roles_dict.get(new_role['id'])
+        # Only roles missing from the previous data can be new
+        if new_role['id'] in old_roles_dict:
+            continue
 
         # Get boolean values directly since they are stored as proper booleans
         new_active = new_role.get('active', False)
         new_is_visible = new_role.get('is_visible', True)  # Default to True since all existing entries use True
         
-        # Check for new, visible, and active roles only
-        if not old_role and new_is_visible and new_active:
+        # Check for visible and active roles only
+        if new_is_visible and new_active:
             # Check if the role was updated within the configured time period
-            days_since_posted = (datetime.now().timestamp() - new_role['date_posted']) / (24 * 60 * 60)
-            if days_since_posted <= config.max_post_age_days:
+            seconds_since_posted = now - new_role['date_posted']
+            if seconds_since_posted <= max_age_seconds:
                 # Add to priority queue in chronological order (oldest first)
                 # Using (timestamp, counter) as the key to ensure unique ordering
                 counter = len(new_roles_heap)  # Use length as a unique secondary key
                 heapq.heappush(new_roles_heap, (new_role['date_posted'], counter, new_role))
-                logger.debug(f"New role found: {new_role['title']} at {new_role['company_name']}")
+                if log_each_role:
+                    logger.debug(f"New role found: {new_role['title']} at {new_role['company_name']}")
             else:
-                logger.debug(f"Skipping old role: {new_role['title']} at {new_role['company_name']} (posted {days_since_posted:.1f} days ago, max age: {config.max_post_age_days} days)")
+                skipped_old_count += 1
+                if log_each_role:
+                    days_since_posted = seconds_since_posted / (24 * 60 * 60)
+                    logger.debug(f"Skipping old role: {new_role['title']} at {new_role['company_name']} (posted {days_since_posted:.1f} days ago, max age: {config.max_post_age_days} days)")
 
-    logger.debug(f"Found {len(new_roles_heap)} new roles, processing in chronological order")
+    logger.info(f"Found {len(new_roles_heap)} new roles, skipped {skipped_old_count} older than {config.max_post_age_days} days")
 
-    # Process roles in order (oldest first)
-    while new_roles_heap:
-        _, _, role = heapq.heappop(new_roles_heap)  # Unpack timestamp, counter, and role
-        role_key = role['id']
-        message = format_message(role)
-        await send_messages_to_channels(message, role_key)
-
-    # Update previous data
-    storage.save_data(new_data)
+    # Process roles in order (oldest first), writing message tracking once at the end
+    try:
+        with storage.buffered(flush=False):
+            while new_roles_heap:
+                _, _, role = heapq.heappop(new_roles_heap)  # Unpack timestamp, counter, and role
+                role_key = role['id']
+                message = format_message(role)
+                await send_messages_to_channels(message, role_key)
+    finally:
+        # Write the buffered tracking off the event loop (includes an fsync)
+        await loop.run_in_executor(None, storage.flush)
+
+    # Update previous data without blocking the event loop on file I/O
+    await loop.run_in_executor(None, storage.save_data, new_data)
     logger.debug("Updated previous data with new data.")
 
 
@@ -282,22 +376,25 @@ async def get_role_data_by_message_id(message_id: str) -> Optional[Dict[str, Any
     Returns:
         Optional[Dict[str, Any]]: The role data if found, None otherwise
     """
-    # Load all data
     storage = get_storage('file', 
                         data_file=config.data_file, 
                         messages_file=config.messages_file)
-    all_data = read_json()
     
-    # For each role key in storage, check if the message ID matches
-    for role in all_data:
-        role_key = role['id']
-        messages = storage.get_messages_for_role(role_key)
-        
-        for message_info in messages:
-            if message_info.get('message_id') == message_id:
-                return role
+    # Look up the role the message was posted for; untracked messages have no role
+    role_key = storage.get_role_key_for_message(message_id)
+    if role_key is None:
+        return None
+    
+    # The stored data may need re-parsing after an external rewrite, so load it off the event loop
+    loop = asyncio.get_running_loop()
+    role = await loop.run_in_executor(None, storage.get_role_by_id, role_key)
+    if role is not None:
+        return role
     
-    return None
+    # Roles posted during the current check are not in the stored data until it
+    # finishes, so fall back to the listings file
+    all_data = await loop.run_in_executor(None, read_json)
+    return next((role for role in all_data if role['id'] == role_key), None)
 
 
 @bot.event
@@ -342,6 +439,10 @@ async def on_reaction_add(reaction: discord.Reaction, user: discord.User) -> Non
     if user.id == bot.user.id:
         return
     
+    # Only the reactions the bot adds request job details
+    if str(reaction.emoji) not in REACTIONS:
+        return
+    
     # Get the message and channel
     message = reaction.message
     
@@ -391,6 +492,15 @@ def run_bot() -> None:
     # Run the bot with proper cleanup
     async def run_with_cleanup():
         """Run bot with proper session cleanup."""
+        # Keep REST connections and DNS lookups warm between bursts of sends;
+        # discord.py otherwise uses aiohttp's 15s keep-alive and 10s DNS cache.
+        # Discord does not support IPv6, matching discord.py's own connector.
+        bot.http.connector = aiohttp.TCPConnector(
+            limit=0,
+            family=socket.AF_INET,
+            ttl_dns_cache=300,
+            keepalive_timeout=75,
+        )
         try:
             await bot.start(config.discord_token)
         finally:
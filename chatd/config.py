@@ -10,7 +10,7 @@ import sys
 import subprocess
 import tempfile
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Mapping, Optional
 
 import logging
 from dotenv import load_dotenv
@@ -28,6 +28,8 @@ DEFAULT_CONFIG = {
     'LOG_FILE': '/app/logs/chatd.log',
     'LOG_LEVEL': 'INFO',
     'MAX_RETRIES': '3',
+    'SEND_CONCURRENCY': '8',
+    'FAILED_CHANNEL_RETRY_MINUTES': '30',
     'CHECK_INTERVAL_MINUTES': '1',
     'ENABLE_REACTIONS': 'false',
     'MAX_POST_AGE_DAYS': '5',
@@ -60,9 +62,37 @@ class Config:
         # Load environment variables from .env file
         load_dotenv()
         
+        self._load(os.environ)
+        self._initialized = True
+    
+    @classmethod
+    def _from_mapping(cls, mapping: Mapping[str, str]) -> 'Config':
+        """
+        Build a standalone configuration from a mapping instead of the environment.
+        
+        The returned instance is not the singleton and no .env file is read.
+        
+        Args:
+            mapping: Configuration values keyed by environment variable name
+            
+        Returns:
+            Config: The new configuration instance
+        """
+        instance = super(Config, cls).__new__(cls)
+        instance._load(mapping)
+        instance._initialized = True
+        return instance
+    
+    def _load(self, env: Mapping[str, str]) -> None:
+        """
+        Load configuration values from a mapping of environment variables.
+        
+        Args:
+            env: Configuration values keyed by environment variable name
+        """
         # Set default values, but don't let empty environment variables override defaults
         for key, default_value in DEFAULT_CONFIG.items():
-            env_value = os.getenv(key)
+            env_value = env.get(key)
             # Use environment value only if it's not None and not empty
             if env_value is not None and env_value.strip() != '':
                 setattr(self, key.lower(), env_value)
@@ -79,11 +109,13 @@ class Config:
         
         # Parse channel IDs as a list
         self.channel_ids = [
-            id.strip() for id in os.getenv('CHANNEL_IDS', '').split(',')
-        ] if os.getenv('CHANNEL_IDS') else []
+            id.strip() for id in env.get('CHANNEL_IDS', '').split(',')
+        ] if env.get('CHANNEL_IDS') else []
         
         # Convert numeric values to integers
         self.max_retries = int(self.max_retries)
+        self.send_concurrency = int(self.send_concurrency)
+        self.failed_channel_retry_minutes = int(self.failed_channel_retry_minutes)
         self.check_interval_minutes = int(self.check_interval_minutes)
         self.max_post_age_days = int(self.max_post_age_days)
         
@@ -91,12 +123,10 @@ class Config:
         self.enable_reactions = self.enable_reactions.lower() in ('true', '1', 'yes', 'on')
         
         # Set Discord token
-        self.discord_token = os.getenv('DISCORD_TOKEN')
+        self.discord_token = env.get('DISCORD_TOKEN')
         
         # Set timezone (empty string means use system default)
-        self.timezone = os.getenv('TIMEZONE', '').strip()
-        
-        self._initialized = True
+        self.timezone = env.get('TIMEZONE', '').strip()
 
     def validate(self) -> bool:
         """
@@ -209,6 +239,18 @@ class Config:
             logger.error("   This controls how many times to retry failed operations")
             return False
         
+        # Validate send concurrency
+        if not (1 <= self.send_concurrency <= 50):
+            logger.error(f"❌ SEND_CONCURRENCY must be between 1 and 50. Got: {self.send_concurrency}")
+            logger.error("   This controls how many channels a job posting is sent to at once")
+            return False
+        
+        # Validate failed channel retry period
+        if not (1 <= self.failed_channel_retry_minutes <= 1440):
+            logger.error(f"❌ FAILED_CHANNEL_RETRY_MINUTES must be between 1 and 1440 minutes. Got: {self.failed_channel_retry_minutes}")
+            logger.error("   This controls how long a failing channel is skipped before it is retried")
+            return False
+        
         logger.info("✅ Numeric configuration validation passed")
         return True
 
@@ -0,0 +1,49 @@
+"""
+JSON serialization helpers for the chatd-internships bot.
+
+This module wraps orjson when it is available and falls back to the
+standard library json module otherwise.
+"""
+
+import json
+from typing import Any, Union
+
+# Import orjson support
+try:
+    import orjson
+except ImportError:
+    # If orjson is not installed, we'll use the standard library json module
+    orjson = None
+
+
+def json_dumps(data: Any) -> bytes:
+    """
+    Serialize data to a UTF-8 encoded JSON document.
+
+    The whole document is built in memory so callers can write it
+    with a single write() call.
+
+    Args:
+        data: The data to serialize
+
+    Returns:
+        bytes: The encoded JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+
+def json_loads(data: Union[bytes, str]) -> Any:
+    """
+    Parse a JSON document.
+
+    Args:
+        data: The raw document, preferably as bytes read from a binary file
+
+    Returns:
+        Any: The decoded data
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -4,7 +4,6 @@ Repository management for the chatd-internships bot.
 This module handles cloning, updating, and reading data from the GitHub repository.
 """
 
-import json
 import os
 import shutil
 from typing import Dict, List, Any
@@ -12,6 +11,7 @@ from typing import Dict, List, Any
 import git
 
 from chatd.config import config
+from chatd.json_utils import json_loads
 from chatd.logging_utils import get_logger
 
 # Get logger
@@ -84,8 +84,8 @@ def read_json() -> List[Dict[str, Any]]:
     """
     logger.debug(f"Reading JSON file from {config.json_file_path}...")
     
-    with open(config.json_file_path, 'r') as file:
-        data = json.load(file)
+    with open(config.json_file_path, 'rb') as file:
+        data = json_loads(file.read())
     
     logger.debug(f"JSON file read successfully, {len(data)} items loaded.")
     return data
@@ -4,11 +4,13 @@ Data storage for the chatd-internships bot.
 This module handles persistent storage of data using various backends (file, DB, Redis).
 """
 
-import json
 import os
+import threading
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional, Type
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Any, Optional, Tuple, Type
 
+from chatd.json_utils import json_dumps, json_loads
 from chatd.logging_utils import get_logger
 
 # Get logger
@@ -41,6 +43,29 @@ class Storage(ABC):
         """
         pass
     
+    @abstractmethod
+    def get_roles_by_id(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get all stored roles keyed by their ID.
+        
+        Returns:
+            Dict[str, Dict[str, Any]]: Mapping of role ID to role data
+        """
+        pass
+    
+    @abstractmethod
+    def get_role_by_id(self, role_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a stored role by its ID.
+        
+        Args:
+            role_id: The role ID
+            
+        Returns:
+            Optional[Dict[str, Any]]: The role data if found, None otherwise
+        """
+        pass
+    
     @abstractmethod
     def save_message_info(self, message_id: str, channel_id: str, role_key: str) -> bool:
         """
@@ -68,6 +93,57 @@ class Storage(ABC):
             List[Dict[str, str]]: List of message info dictionaries
         """
         pass
+    
+    @abstractmethod
+    def get_role_key_for_message(self, message_id: str) -> Optional[str]:
+        """
+        Get the role key a sent message was posted for.
+        
+        Args:
+            message_id: Discord message ID
+            
+        Returns:
+            Optional[str]: The role key if the message is tracked, None otherwise
+        """
+        pass
+    
+    def save_message_info_many(self, entries: List[Tuple[str, str, str]]) -> bool:
+        """
+        Save information about several sent messages at once.
+        
+        Args:
+            entries: (message_id, channel_id, role_key) tuples
+            
+        Returns:
+            bool: True if all entries were saved, False otherwise
+        """
+        with self.buffered():
+            results = [self.save_message_info(*entry) for entry in entries]
+        return all(results)
+    
+    def flush(self) -> bool:
+        """
+        Write any buffered changes to storage.
+        
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        return True
+    
+    @contextmanager
+    def buffered(self, flush: bool = True) -> Iterator['Storage']:
+        """
+        Defer message info writes until the end of the block.
+        
+        Backends that write through on every call may ignore this.
+        
+        Args:
+            flush: Whether to flush on exit; pass False to call flush() yourself
+            
+        Yields:
+            Storage: This storage instance
+        """
+        yield self
 
 
 class FileStorage(Storage):
@@ -76,7 +152,64 @@ class FileStorage(Storage):
     def __init__(self, data_file: str = 'previous_data.json', messages_file: str = 'messages.json'):
         self.data_file = data_file
         self.messages_file = messages_file
+        # One lock per file, so a small messages write never waits on a large data write
+        self._write_locks: Dict[str, threading.Lock] = {
+            data_file: threading.Lock(),
+            messages_file: threading.Lock(),
+        }
+        # Parsed data file contents, keyed on the file's (mtime, size)
+        self._data_cache: Optional[Tuple[Tuple[int, int], List[Dict[str, Any]]]] = None
+        # ID lookup table for the cached data list it was built from
+        self._data_index: Optional[Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]] = None
         self._message_cache = self._load_messages()
+        # Reverse index of the message cache: message ID -> role key
+        self._message_roles = self._build_message_index(self._message_cache)
+        # Message info write buffering state (see buffered())
+        self._buffer_depth = 0
+        self._messages_dirty = False
+    
+    @staticmethod
+    def _file_key(path: str) -> Tuple[int, int]:
+        """
+        Get a key identifying the current version of a file.
+        
+        Args:
+            path: Path of the file
+            
+        Returns:
+            Tuple[int, int]: The file's modification time (ns) and size
+        """
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def _write_file(self, path: str, data: Any) -> None:
+        """
+        Atomically replace a JSON file with new contents.
+        
+        The document is written and fsynced to a temporary file next to the
+        target and then renamed over it, so readers never see a partially
+        written file and a crash leaves either the old or the new contents.
+        
+        Args:
+            path: Path of the file to replace
+            data: Data to serialize into the file
+        """
+        payload = json_dumps(data)
+        temp_path = f"{path}.tmp"
+        with self._write_locks[path]:
+            try:
+                with open(temp_path, 'wb') as file:
+                    file.write(payload)
+                    file.flush()
+                    os.fsync(file.fileno())
+                os.replace(temp_path, path)
+            except BaseException:
+                # Don't leave a partial temporary file behind
+                try:
+                    os.unlink(temp_path)
+                except OSError:
+                    pass
+                raise
     
     def save_data(self, data: List[Dict[str, Any]]) -> bool:
         """
@@ -89,8 +222,8 @@ class FileStorage(Storage):
             bool: True if successful, False otherwise
         """
         try:
-            with open(self.data_file, 'w') as file:
-                json.dump(data, file)
+            self._write_file(self.data_file, data)
+            self._data_cache = (self._file_key(self.data_file), data)
             logger.debug(f"Saved {len(data)} items to {self.data_file}")
             return True
         except Exception as e:
@@ -101,6 +234,9 @@ class FileStorage(Storage):
         """
         Load data from a JSON file.
         
+        The parsed data is cached and reused until the file changes on disk,
+        so callers must not mutate the returned list.
+        
         Returns:
             List[Dict[str, Any]]: The loaded data
         """
@@ -109,14 +245,49 @@ class FileStorage(Storage):
             return []
             
         try:
-            with open(self.data_file, 'r') as file:
-                data = json.load(file)
+            file_key = self._file_key(self.data_file)
+            if self._data_cache is not None and self._data_cache[0] == file_key:
+                logger.debug(f"Using cached data for {self.data_file}")
+                return self._data_cache[1]
+            
+            with open(self.data_file, 'rb') as file:
+                data = json_loads(file.read())
+            self._data_cache = (file_key, data)
             logger.debug(f"Loaded {len(data)} items from {self.data_file}")
             return data
         except Exception as e:
             logger.error(f"Error loading data from {self.data_file}: {e}")
             return []
     
+    def get_roles_by_id(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get all stored roles keyed by their ID.
+        
+        The mapping is cached along with the data, so callers must not mutate it.
+        
+        Returns:
+            Dict[str, Dict[str, Any]]: Mapping of role ID to role data
+        """
+        data = self.load_data()
+        
+        # Rebuild the index only when load_data returned a different list
+        if self._data_index is None or self._data_index[0] is not data:
+            self._data_index = (data, {role['id']: role for role in data if 'id' in role})
+        
+        return self._data_index[1]
+    
+    def get_role_by_id(self, role_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a stored role by its ID.
+        
+        Args:
+            role_id: The role ID
+            
+        Returns:
+            Optional[Dict[str, Any]]: The role data if found, None otherwise
+        """
+        return self.get_roles_by_id().get(role_id)
+    
     def _load_messages(self) -> Dict[str, List[Dict[str, str]]]:
         """
         Load message information from a JSON file.
@@ -128,13 +299,39 @@ class FileStorage(Storage):
             return {}
             
         try:
-            with open(self.messages_file, 'r') as file:
-                data = json.load(file)
+            with open(self.messages_file, 'rb') as file:
+                data = json_loads(file.read())
             return data
         except Exception as e:
             logger.error(f"Error loading message info from {self.messages_file}: {e}")
             return {}
     
+    @staticmethod
+    def _build_message_index(message_cache: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Build the message ID -> role key index for loaded message info.
+        
+        Older tracking files may hold a single message info dict per role
+        instead of a list, so both forms are accepted and anything else is skipped.
+        
+        Args:
+            message_cache: Message info keyed by role key
+            
+        Returns:
+            Dict[str, str]: Mapping of message ID to role key
+        """
+        message_roles = {}
+        for role_key, messages in message_cache.items():
+            if isinstance(messages, dict):
+                messages = [messages]
+            elif not isinstance(messages, list):
+                continue
+            
+            for message_info in messages:
+                if isinstance(message_info, dict) and 'message_id' in message_info:
+                    message_roles[message_info['message_id']] = role_key
+        return message_roles
+    
     def _save_messages(self) -> bool:
         """
         Save message information to a JSON file.
@@ -143,8 +340,7 @@ class FileStorage(Storage):
             bool: True if successful, False otherwise
         """
         try:
-            with open(self.messages_file, 'w') as file:
-                json.dump(self._message_cache, file)
+            self._write_file(self.messages_file, self._message_cache)
             return True
         except Exception as e:
             logger.error(f"Error saving message info to {self.messages_file}: {e}")
@@ -162,16 +358,78 @@ class FileStorage(Storage):
         Returns:
             bool: True if successful, False otherwise
         """
-        if role_key not in self._message_cache:
-            self._message_cache[role_key] = []
+        return self.save_message_info_many([(message_id, channel_id, role_key)])
+    
+    def save_message_info_many(self, entries: List[Tuple[str, str, str]]) -> bool:
+        """
+        Save information about several sent messages with a single write.
+        
+        Args:
+            entries: (message_id, channel_id, role_key) tuples
             
-        self._message_cache[role_key].append({
-            'message_id': message_id,
-            'channel_id': channel_id,
-        })
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        for message_id, channel_id, role_key in entries:
+            if role_key not in self._message_cache:
+                self._message_cache[role_key] = []
+                
+            self._message_cache[role_key].append({
+                'message_id': message_id,
+                'channel_id': channel_id,
+            })
+            self._message_roles[message_id] = role_key
+        
+        # Defer the write while inside a buffered() block
+        if self._buffer_depth > 0:
+            self._messages_dirty = True
+            return True
         
         return self._save_messages()
     
+    def flush(self) -> bool:
+        """
+        Write buffered message info to the messages file.
+        
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not self._messages_dirty:
+            return True
+        
+        # Clear the flag before writing, so entries added while an executor
+        # thread is writing stay marked for the next flush
+        self._messages_dirty = False
+        if not self._save_messages():
+            self._messages_dirty = True
+            return False
+        
+        return True
+    
+    @contextmanager
+    def buffered(self, flush: bool = True) -> Iterator['FileStorage']:
+        """
+        Defer message info writes until the end of the block.
+        
+        Each save_message_info call inside the block only updates the
+        in-memory cache; the messages file is rewritten once on exit.
+        Blocks may be nested, in which case the outermost one flushes.
+        
+        Args:
+            flush: Whether to flush on exit; pass False to call flush() yourself,
+                e.g. from an executor thread
+            
+        Yields:
+            FileStorage: This storage instance
+        """
+        self._buffer_depth += 1
+        try:
+            yield self
+        finally:
+            self._buffer_depth -= 1
+            if self._buffer_depth == 0 and flush:
+                self.flush()
+    
     def get_messages_for_role(self, role_key: str) -> List[Dict[str, str]]:
         """
         Get all messages sent for a role.
@@ -183,6 +441,18 @@ class FileStorage(Storage):
             List[Dict[str, str]]: List of message info dictionaries
         """
         return self._message_cache.get(role_key, [])
+    
+    def get_role_key_for_message(self, message_id: str) -> Optional[str]:
+        """
+        Get the role key a sent message was posted for.
+        
+        Args:
+            message_id: Discord message ID
+            
+        Returns:
+            Optional[str]: The role key if the message is tracked, None otherwise
+        """
+        return self._message_roles.get(message_id)
 
 
 # Factory for creating storage instances
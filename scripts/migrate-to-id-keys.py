@@ -14,18 +14,75 @@ Usage: python scripts/migrate-to-id-keys.py
 import json
 import os
 import shutil
+import tempfile
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, List, Any, Optional
 
+# Use orjson for faster (de)serialization when it is installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def load_json(path: str) -> Any:
+    """Read and parse a JSON file in one pass over its raw bytes."""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def dump_json(data: Any) -> bytes:
+    """Serialize data to a compact UTF-8 JSON document."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+
+def write_file_atomic(path: str, payload: bytes) -> None:
+    """Write payload to a temp file beside path, fsync it, then swap it into place."""
+    fd, tmp_name = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        # Temp files are created owner-only; keep the original file's permissions
+        if os.path.exists(path):
+            shutil.copymode(path, tmp_name)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+@lru_cache(maxsize=None)
+def norm(s: Optional[str]) -> str:
+    """Normalize a key component; cached since company names repeat across listings."""
+    return (s or "").strip().lower()
+
+
+def create_backup(path: str, backup_path: str) -> None:
+    """
+    Back up path without copying its contents where possible.
+
+    The migrated file is swapped in with os.replace, which leaves the
+    original inode untouched, so a hard link is a complete backup. Fall
+    back to a full copy where links are unsupported (e.g. across devices).
+    """
+    try:
+        os.link(path, backup_path)
+    except OSError:
+        shutil.copy2(path, backup_path)
+
 
 def normalize_old_role_key(role: Dict[str, Any]) -> str:
     """
     Create the OLD normalized key format for backward compatibility.
     This matches the previous get_role_id function's fallback behavior.
     """
-    def norm(s: Optional[str]) -> str:
-        return (s or "").strip().lower()
-
     company = norm(role.get('company_name'))
     title = norm(role.get('title'))
     date_posted = role.get('date_posted', 0)
@@ -55,31 +112,38 @@ def main():
     # Load data
     print("📂 Loading data files...")
     
-    with open(listings_file, 'r') as f:
-        listings = json.load(f)
-    
-    with open(tracking_file, 'r') as f:
-        old_tracking = json.load(f)
-    
-    print(f"📊 Loaded {len(listings)} listings and {len(old_tracking)} tracked messages")
+    # Only the old key -> ID mapping is needed from the listings, so build it
+    # and release the parsed listings before loading the tracking data
+    listings = load_json(listings_file)
+    listings_count = len(listings)
     
     # Create mapping from old keys to IDs
     print("🔍 Creating old key -> ID mapping...")
     old_key_to_id = {}
+    duplicate_keys = []
     
     for entry in listings:
         if 'id' in entry:
             old_key = normalize_old_role_key(entry)
-            entry_id = entry['id']
-            
-            if old_key in old_key_to_id:
-                print(f"⚠️  Duplicate old key found: {old_key}")
-                print(f"   Existing ID: {old_key_to_id[old_key]}")
-                print(f"   New ID: {entry_id}")
-                # Keep the first one we found
-            else:
-                old_key_to_id[old_key] = entry_id
+            # Keep the first ID we find for each old key
+            kept_id = old_key_to_id.setdefault(old_key, entry['id'])
+            if kept_id != entry['id']:
+                duplicate_keys.append((old_key, kept_id, entry['id']))
+    
+    if duplicate_keys:
+        print(f"⚠️  Found {len(duplicate_keys)} duplicate old keys, kept the first ID for each (first 5):")
+        for old_key, kept_id, new_id in duplicate_keys[:5]:
+            print(f"   {old_key[:100]}...")
+            print(f"      Existing ID: {kept_id}")
+            print(f"      New ID: {new_id}")
+        if len(duplicate_keys) > 5:
+            print(f"   ... and {len(duplicate_keys) - 5} more")
+    
+    del listings
+    
+    old_tracking = load_json(tracking_file)
     
+    print(f"📊 Loaded {listings_count} listings and {len(old_tracking)} tracked messages")
     print(f"🗺️  Created mapping for {len(old_key_to_id)} unique old keys")
     
     # Migrate tracking data
@@ -92,6 +156,7 @@ def main():
     }
     
     not_found_keys = []
+    seen_message_ids = {}
     
     for old_key, message_info in old_tracking.items():
         if old_key in old_key_to_id:
@@ -102,11 +167,15 @@ def main():
                 existing_messages = new_tracking[new_id]
                 new_messages = message_info if isinstance(message_info, list) else [message_info]
                 
-                # Avoid duplicates based on message_id
-                existing_msg_ids = {msg.get('message_id') for msg in existing_messages if isinstance(msg, dict)}
+                # Avoid duplicates based on message_id, keeping one set per ID across merges
+                existing_msg_ids = seen_message_ids.get(new_id)
+                if existing_msg_ids is None:
+                    existing_msg_ids = {msg.get('message_id') for msg in existing_messages if isinstance(msg, dict)}
+                    seen_message_ids[new_id] = existing_msg_ids
                 
                 for msg in new_messages:
                     if isinstance(msg, dict) and msg.get('message_id') not in existing_msg_ids:
+                        existing_msg_ids.add(msg.get('message_id'))
                         existing_messages.append(msg)
                 
                 migration_stats['duplicates'] += 1
@@ -127,8 +196,7 @@ def main():
     
     if not_found_keys:
         print("❌ Keys not found in current listings (first 5):")
-        for key in not_found_keys[:5]:
-            print(f"   {key[:100]}...")
+        print("\n".join(f"   {key[:100]}..." for key in not_found_keys[:5]))
         if len(not_found_keys) > 5:
             print(f"   ... and {len(not_found_keys) - 5} more")
         print()
@@ -141,12 +209,11 @@ def main():
     
     # Backup original file
     print(f"💾 Creating backup: {backup_file}")
-    shutil.copy2(tracking_file, backup_file)
+    create_backup(tracking_file, backup_file)
     
     # Write new tracking file
     print(f"💾 Writing migrated data to: {tracking_file}")
-    with open(tracking_file, 'w') as f:
-        json.dump(new_tracking, f, indent=2)
+    write_file_atomic(tracking_file, dump_json(new_tracking))
     
     print()
     print("✅ Migration completed successfully!")
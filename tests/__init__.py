@@ -1,3 +1,11 @@
 """
 Test package initialization.
 """
+
+import os
+import tempfile
+
+# Give each pytest-xdist worker its own log file instead of sharing ./chatd.log
+_xdist_worker = os.getenv('PYTEST_XDIST_WORKER')
+if _xdist_worker:
+    os.environ.setdefault('LOG_FILE', os.path.join(tempfile.gettempdir(), f'chatd-test-{_xdist_worker}.log'))
@@ -4,122 +4,189 @@ Tests for Discord bot operations.
 
 import asyncio
 import os
+import shutil
+import tempfile
+import time
 import unittest
+from contextlib import ExitStack, contextmanager
+from datetime import datetime
+from types import SimpleNamespace
 from unittest.mock import Mock, patch, AsyncMock, MagicMock
 import discord
 from discord.ext import commands
 
+from chatd import bot
+from chatd.bot import (
+    add_reactions_to_message,
+    channel_failure_counts,
+    check_for_new_roles,
+    failed_channel_times,
+    failed_channels,
+    get_role_data_by_message_id,
+    on_reaction_add,
+    send_dm_with_job_info,
+    send_message,
+    send_messages_to_channels,
+)
+from chatd.config import Config
+from chatd.storage import FileStorage
+
 
 class TestDiscordBotOperations(unittest.IsolatedAsyncioTestCase):
     """Test cases for Discord bot operations."""
     
-    def setUp(self):
-        """Set up test environment."""
+    @classmethod
+    def setUpClass(cls):
+        """Set up the environment shared by all tests in the class."""
         # Mock environment
-        self.env_patcher = patch.dict(os.environ, {
+        cls.env_patcher = patch.dict(os.environ, {
             'DISCORD_TOKEN': 'test-token',
             'CHANNEL_IDS': '123456789,987654321',
             'ENABLE_REACTIONS': 'false'
         })
-        self.env_patcher.start()
-        
+        cls.env_patcher.start()
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Restore the environment."""
+        cls.env_patcher.stop()
+    
+    def setUp(self):
+        """Set up test environment."""
         # Reset config singleton
-        from chatd.config import Config
         Config._instance = None
         
         # Clear global bot state
-        from chatd import bot
         bot.failed_channels.clear()
         bot.channel_failure_counts.clear()
+        bot.failed_channel_times.clear()
         
         self.sample_role_key = 'test_company__software_engineer'
     
     def tearDown(self):
         """Clean up after tests."""
-        self.env_patcher.stop()
-        from chatd.config import Config
         Config._instance = None
         
         # Clear global bot state
-        from chatd import bot
         bot.failed_channels.clear()
         bot.channel_failure_counts.clear()
+        bot.failed_channel_times.clear()
+    
+    @contextmanager
+    def _patch_bot_env(self, *, channel=None, storage=None, config_overrides=None):
+        """
+        Patch the Discord bot, config, storage and send delay in one step.
+        
+        Args:
+            channel: Channel returned by bot.get_channel, if any
+            storage: Storage returned by get_storage (defaults to a MagicMock)
+            config_overrides: Config attributes to set on top of the defaults
+            
+        Yields:
+            SimpleNamespace: The bot, config, get_storage, storage and sleep mocks
+        """
+        with ExitStack() as stack:
+            env = SimpleNamespace(
+                bot=stack.enter_context(patch('chatd.bot.bot')),
+                config=stack.enter_context(patch('chatd.bot.config')),
+                get_storage=stack.enter_context(patch('chatd.bot.get_storage')),
+                sleep=stack.enter_context(patch('chatd.bot.asyncio.sleep')),
+                storage=storage if storage is not None else MagicMock(),
+            )
+            settings = {
+                'enable_reactions': False,
+                'max_retries': 3,
+                'send_concurrency': 8,
+                'failed_channel_retry_minutes': 30,
+            }
+            settings.update(config_overrides or {})
+            for name, value in settings.items():
+                setattr(env.config, name, value)
+            env.bot.get_channel.return_value = channel
+            env.get_storage.return_value = env.storage
+            yield env
     
     async def test_send_message_success(self):
         """Test successful message sending."""
-        from chatd.bot import send_message
-        
         # Mock Discord objects
         mock_channel = AsyncMock()
         mock_message = AsyncMock(spec=discord.Message)
         mock_message.id = 12345
         mock_channel.send.return_value = mock_message
         
-        with patch('chatd.bot.bot') as mock_bot, \
-             patch('chatd.bot.config') as mock_config:
+        with self._patch_bot_env(channel=mock_channel) as env:
+            env.storage.save_message_info.return_value = True
             
-            mock_bot.get_channel.return_value = mock_channel
-            mock_config.enable_reactions = False
+            result = await send_message('Test message', '123456789', self.sample_role_key)
             
-            # Mock storage
-            with patch('chatd.bot.get_storage') as mock_get_storage:
-                mock_storage = MagicMock()
-                mock_storage.save_message_info.return_value = True
-                mock_get_storage.return_value = mock_storage
-                
-                result = await send_message('Test message', '123456789', self.sample_role_key)
-                
-                self.assertIsNotNone(result)
-                self.assertEqual(result.id, 12345)
-                mock_channel.send.assert_called_once_with('Test message')
-                mock_storage.save_message_info.assert_called_once()
+            self.assertIsNotNone(result)
+            self.assertEqual(result.id, 12345)
+            mock_channel.send.assert_called_once_with('Test message')
+            env.storage.save_message_info.assert_called_once()
     
     async def test_send_message_channel_not_found(self):
         """Test message sending when channel is not found."""
-        from chatd.bot import send_message
-        
-        with patch('chatd.bot.bot') as mock_bot, \
-             patch('chatd.bot.config') as mock_config:
-            
-            mock_config.max_retries = 3
-            mock_bot.get_channel.return_value = None
-            mock_bot.fetch_channel.side_effect = discord.NotFound(Mock(), 'Channel not found')
+        # Reactions need the fetched channel
+        with self._patch_bot_env(config_overrides={'enable_reactions': True}) as env:
+            env.bot.fetch_channel.side_effect = discord.NotFound(Mock(), 'Channel not found')
             
             result = await send_message('Test message', '123456789')
             
             self.assertIsNone(result)
-            mock_bot.fetch_channel.assert_called_once_with(123456789)
+            env.bot.fetch_channel.assert_called_once_with(123456789)
     
     async def test_send_message_forbidden_error(self):
         """Test message sending with forbidden error."""
-        from chatd.bot import send_message
+        # Reactions need the fetched channel
+        with self._patch_bot_env(config_overrides={'enable_reactions': True}) as env:
+            env.bot.fetch_channel.side_effect = discord.Forbidden(Mock(), 'No permission')
+            
+            result = await send_message('Test message', '123456789')
+            
+            self.assertIsNone(result)
+    
+    async def test_send_message_uncached_channel_without_fetch(self):
+        """Test that uncached channels are sent to by ID when reactions are disabled."""
+        mock_channel = AsyncMock()
+        mock_message = AsyncMock(spec=discord.Message)
+        mock_message.id = 12345
+        mock_channel.send.return_value = mock_message
         
-        with patch('chatd.bot.bot') as mock_bot:
-            mock_bot.get_channel.return_value = None
-            mock_bot.fetch_channel.side_effect = discord.Forbidden(Mock(), 'No permission')
+        with self._patch_bot_env() as env:
+            env.bot.get_partial_messageable.return_value = mock_channel
+            
+            result = await send_message('Test message', '123456789')
+            
+            self.assertIs(result, mock_message)
+            env.bot.get_partial_messageable.assert_called_once_with(123456789)
+            env.bot.fetch_channel.assert_not_called()
+            mock_channel.send.assert_called_once_with('Test message')
+    
+    async def test_send_message_forbidden_on_send(self):
+        """Test that a permission error from send marks the channel failed immediately."""
+        mock_channel = AsyncMock()
+        mock_channel.send.side_effect = discord.Forbidden(Mock(), 'No permission')
+        
+        with self._patch_bot_env() as env:
+            env.bot.get_partial_messageable.return_value = mock_channel
             
             result = await send_message('Test message', '123456789')
             
             self.assertIsNone(result)
+            self.assertIn('123456789', failed_channels)
     
     async def test_send_message_general_exception(self):
         """Test message sending with general exception."""
-        from chatd.bot import send_message
-        
         mock_channel = AsyncMock()
         mock_channel.send.side_effect = Exception('Network error')
         
-        with patch('chatd.bot.bot') as mock_bot:
-            mock_bot.get_channel.return_value = mock_channel
-            
+        with self._patch_bot_env(channel=mock_channel):
             result = await send_message('Test message', '123456789')
             
             self.assertIsNone(result)
     
     async def test_send_messages_to_channels(self):
         """Test sending messages to multiple channels."""
-        from chatd.bot import send_messages_to_channels
-        
         # Mock channels
         mock_channel1 = AsyncMock()
         mock_channel2 = AsyncMock()
@@ -137,24 +204,47 @@ class TestDiscordBotOperations(unittest.IsolatedAsyncioTestCase):
                 return mock_channel2
             return None
         
-        with patch('chatd.bot.bot') as mock_bot, \
+        config_overrides = {'channel_ids': ['123456789', '987654321']}
+        with self._patch_bot_env(config_overrides=config_overrides) as env:
+            env.bot.get_channel.side_effect = get_channel_side_effect
+            env.storage.save_message_info_many.return_value = True
+            
+            results = await send_messages_to_channels('Test message', self.sample_role_key)
+            
+            self.assertEqual(len(results), 2)
+            mock_channel1.send.assert_called_once()
+            mock_channel2.send.assert_called_once()
+            
+            # Message info for both channels is saved in one call
+            env.storage.save_message_info_many.assert_called_once_with([
+                ('12345', '123456789', self.sample_role_key),
+                ('67890', '987654321', self.sample_role_key)
+            ])
+            env.storage.save_message_info.assert_not_called()
+    
+    async def test_send_messages_to_channels_concurrency_limit(self):
+        """Test that sends are limited to SEND_CONCURRENCY channels at once."""
+        in_flight = 0
+        max_in_flight = 0
+        
+        async def fake_send_message(message, channel_id, role_key=None, defer_tracking=False):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return None
+        
+        with patch('chatd.bot.send_message', side_effect=fake_send_message) as mock_send, \
              patch('chatd.bot.config') as mock_config:
             
-            mock_config.channel_ids = ['123456789', '987654321']
-            mock_config.enable_reactions = False
-            mock_bot.get_channel.side_effect = get_channel_side_effect
+            mock_config.channel_ids = ['1', '2', '3', '4']
+            mock_config.send_concurrency = 2
             
-            # Mock storage
-            with patch('chatd.bot.get_storage') as mock_get_storage:
-                mock_storage = MagicMock()
-                mock_storage.save_message_info.return_value = True
-                mock_get_storage.return_value = mock_storage
-                
-                results = await send_messages_to_channels('Test message', self.sample_role_key)
-                
-                self.assertEqual(len(results), 2)
-                mock_channel1.send.assert_called_once()
-                mock_channel2.send.assert_called_once()
+            await send_messages_to_channels('Test message')
+            
+            self.assertEqual(mock_send.call_count, 4)
+            self.assertEqual(max_in_flight, 2)
     
     @patch.dict(os.environ, {
         'DISCORD_TOKEN': 'test-token',
@@ -163,9 +253,6 @@ class TestDiscordBotOperations(unittest.IsolatedAsyncioTestCase):
     })
     async def test_add_reactions_when_enabled(self):
         """Test adding reactions when enabled."""
-        from chatd.config import Config
-        from chatd.bot import add_reactions_to_message
-        
         # Reset config to pick up new environment
         Config._instance = None
         
@@ -174,15 +261,12 @@ class TestDiscordBotOperations(unittest.IsolatedAsyncioTestCase):
         
         await add_reactions_to_message(mock_message)
         
-        # Should add both reactions
+        # Should add both reactions, in order
         self.assertEqual(mock_message.add_reaction.call_count, 2)
-        mock_message.add_reaction.assert_any_call('❓')
-        mock_message.add_reaction.assert_any_call('✅')
+        self.assertEqual([c.args[0] for c in mock_message.add_reaction.call_args_list], ['❓', '✅'])
     
     async def test_add_reactions_error_handling(self):
         """Test reaction adding with error handling."""
-        from chatd.bot import add_reactions_to_message
-        
         mock_message = AsyncMock()
         mock_message.add_reaction.side_effect = Exception('Network error')
         
@@ -194,16 +278,13 @@ class TestDiscordBotOperations(unittest.IsolatedAsyncioTestCase):
     
     async def test_channel_failure_tracking(self):
         """Test channel failure tracking mechanism."""
-        from chatd.bot import send_message, failed_channels, channel_failure_counts
-        
         # Clear any existing failure state
         failed_channels.clear()
         channel_failure_counts.clear()
         
-        with patch('chatd.bot.bot') as mock_bot:
+        with self._patch_bot_env(config_overrides={'enable_reactions': True}) as env:
             # Simulate channel fetch failure
-            mock_bot.get_channel.return_value = None
-            mock_bot.fetch_channel.side_effect = Exception('Network error')
+            env.bot.fetch_channel.side_effect = Exception('Network error')
             
             # Send message multiple times to same channel
             for _ in range(4):  # More than MAX_RETRIES (3)
@@ -214,8 +295,6 @@ class TestDiscordBotOperations(unittest.IsolatedAsyncioTestCase):
     
     async def test_failed_channel_skip(self):
         """Test that failed channels are skipped."""
-        from chatd.bot import send_message, failed_channels
-        
         # Add channel to failed list
         failed_channels.add('123456789')
         
@@ -226,39 +305,81 @@ class TestDiscordBotOperations(unittest.IsolatedAsyncioTestCase):
             self.assertIsNone(result)
             mock_bot.get_channel.assert_not_called()
     
-    async def test_get_role_data_by_message_id(self):
-        """Test retrieving role data by message ID."""
-        from chatd.bot import get_role_data_by_message_id
+    async def test_failed_channel_retried_after_period(self):
+        """Test that failed channels are retried once the retry period has passed."""
+        failed_channels.add('123456789')
+        failed_channel_times['123456789'] = time.monotonic() - 31 * 60
         
-        # Mock storage with message data
-        mock_messages = [
-            {'message_id': '12345', 'channel_id': '123456789', 'role_key': 'test_role'}
-        ]
+        mock_channel = AsyncMock()
         
-        mock_roles = [
-            {
-                'id': 'test_role',
-                'company_name': 'Test Company',
-                'title': 'Software Engineer',
-                'url': 'https://example.com'
-            }
-        ]
+        config_overrides = {'failed_channel_retry_minutes': 30}
+        with self._patch_bot_env(channel=mock_channel, config_overrides=config_overrides):
+            result = await send_message('Test message', '123456789')
+            
+            self.assertIsNotNone(result)
+            mock_channel.send.assert_called_once_with('Test message')
+            self.assertNotIn('123456789', failed_channels)
+            self.assertNotIn('123456789', failed_channel_times)
+    
+    async def test_get_role_data_by_message_id(self):
+        """Test retrieving role data by message ID."""
+        mock_role = {
+            'id': 'test_role',
+            'company_name': 'Test Company',
+            'title': 'Software Engineer',
+            'url': 'https://example.com'
+        }
         
         with patch('chatd.bot.get_storage') as mock_get_storage:
             mock_storage = MagicMock()
-            mock_storage.get_messages_for_role.return_value = mock_messages
+            mock_storage.get_role_key_for_message.return_value = 'test_role'
+            mock_storage.get_role_by_id.return_value = mock_role
             mock_get_storage.return_value = mock_storage
             
-            with patch('chatd.bot.read_json', return_value=mock_roles):
+            result = await get_role_data_by_message_id('12345')
+            
+            self.assertIsNotNone(result)
+            self.assertEqual(result['company_name'], 'Test Company')
+            mock_storage.get_role_key_for_message.assert_called_once_with('12345')
+            mock_storage.get_role_by_id.assert_called_once_with('test_role')
+    
+    async def test_get_role_data_by_message_id_untracked(self):
+        """Test retrieving role data for a message that is not tracked."""
+        with patch('chatd.bot.get_storage') as mock_get_storage, \
+             patch('chatd.bot.read_json') as mock_read_json:
+            mock_storage = MagicMock()
+            mock_storage.get_role_key_for_message.return_value = None
+            mock_get_storage.return_value = mock_storage
+            
+            result = await get_role_data_by_message_id('12345')
+            
+            self.assertIsNone(result)
+            mock_storage.get_role_by_id.assert_not_called()
+            mock_read_json.assert_not_called()
+    
+    async def test_get_role_data_by_message_id_current_poll(self):
+        """Test a reaction to a message posted before the previous data is saved."""
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, ignore_errors=True)
+        storage = FileStorage(
+            data_file=os.path.join(temp_dir, 'previous_data.json'),
+            messages_file=os.path.join(temp_dir, 'messages.json')
+        )
+        storage.save_data([{'id': 'old_role'}])
+        new_role = {'id': 'new_role', 'company_name': 'Test Company'}
+        
+        # The message is tracked, but save_data has not run for this poll yet
+        with storage.buffered(flush=False):
+            storage.save_message_info('12345', '123456789', 'new_role')
+            
+            with patch('chatd.bot.get_storage', return_value=storage), \
+                 patch('chatd.bot.read_json', return_value=[{'id': 'old_role'}, new_role]):
                 result = await get_role_data_by_message_id('12345')
-                
-                self.assertIsNotNone(result)
-                self.assertEqual(result['company_name'], 'Test Company')
+        
+        self.assertEqual(result, new_role)
     
     async def test_send_dm_with_job_info(self):
         """Test sending DM with job information."""
-        from chatd.bot import send_dm_with_job_info
-        
         mock_user = AsyncMock()
         mock_user.send = AsyncMock()
         
@@ -279,41 +400,167 @@ class TestDiscordBotOperations(unittest.IsolatedAsyncioTestCase):
         self.assertIn('Software Engineer', call_args)
 
 
-class TestBotEventHandlers(unittest.IsolatedAsyncioTestCase):
-    """Test cases for Discord bot event handlers."""
+class TestCheckForNewRoles(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the periodic new role check."""
     
     def setUp(self):
         """Set up test environment."""
-        self.env_patcher = patch.dict(os.environ, {
+        self.temp_dir = tempfile.mkdtemp()
+        self.storage = FileStorage(
+            data_file=os.path.join(self.temp_dir, 'previous_data.json'),
+            messages_file=os.path.join(self.temp_dir, 'messages.json')
+        )
+        self.now = datetime.now().timestamp()
+    
+    def tearDown(self):
+        """Clean up after tests."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _role(self, role_id, days_ago=1, active=True, is_visible=True):
+        """Build a listing posted the given number of days ago."""
+        return {
+            'id': role_id,
+            'company_name': 'Test Company',
+            'title': f'Role {role_id}',
+            'active': active,
+            'is_visible': is_visible,
+            'date_posted': self.now - days_ago * 24 * 60 * 60,
+        }
+    
+    async def _run_check(self, new_data, on_send=None):
+        """
+        Run check_for_new_roles against new_data with sends recorded.
+        
+        Args:
+            new_data: Listings returned by read_json
+            on_send: Optional callback run with each role key as it is sent
+            
+        Returns:
+            List[str]: Role keys in the order they were sent
+        """
+        sent = []
+        
+        async def fake_send_messages_to_channels(message, role_key=None):
+            sent.append(role_key)
+            self.storage.save_message_info_many([(f'msg-{role_key}', '123456789', role_key)])
+            if on_send is not None:
+                on_send(role_key)
+            return []
+        
+        with patch('chatd.bot.clone_or_update_repo', return_value=True), \
+             patch('chatd.bot.read_json', return_value=new_data), \
+             patch('chatd.bot.get_storage', return_value=self.storage), \
+             patch('chatd.bot.format_message', side_effect=lambda role: role['title']), \
+             patch('chatd.bot.send_messages_to_channels', side_effect=fake_send_messages_to_channels), \
+             patch('chatd.bot.config') as mock_config:
+            mock_config.max_post_age_days = 7
+            await check_for_new_roles()
+        
+        return sent
+    
+    async def test_no_updates_skips_check(self):
+        """Test that nothing is read or sent when the repository is unchanged."""
+        with patch('chatd.bot.clone_or_update_repo', return_value=False), \
+             patch('chatd.bot.read_json') as mock_read_json, \
+             patch('chatd.bot.send_messages_to_channels') as mock_send:
+            await check_for_new_roles()
+            
+            mock_read_json.assert_not_called()
+            mock_send.assert_not_called()
+    
+    async def test_skips_known_roles(self):
+        """Test that roles already in the previous data are not sent again."""
+        self.storage.save_data([self._role('known')])
+        
+        sent = await self._run_check([self._role('known'), self._role('new')])
+        
+        self.assertEqual(sent, ['new'])
+    
+    async def test_filters_inactive_hidden_and_old_roles(self):
+        """Test that only active, visible roles within the age limit are sent."""
+        new_data = [
+            self._role('inactive', active=False),
+            self._role('hidden', is_visible=False),
+            self._role('old', days_ago=30),
+            self._role('fresh'),
+        ]
+        
+        sent = await self._run_check(new_data)
+        
+        self.assertEqual(sent, ['fresh'])
+    
+    async def test_sends_oldest_first(self):
+        """Test that new roles are sent in posting order, oldest first."""
+        new_data = [self._role('newest', days_ago=1), self._role('oldest', days_ago=3),
+                    self._role('middle', days_ago=2)]
+        
+        sent = await self._run_check(new_data)
+        
+        self.assertEqual(sent, ['oldest', 'middle', 'newest'])
+    
+    async def test_tracking_flushed_once_after_sends(self):
+        """Test that message tracking is written once, after every role is sent."""
+        with patch.object(self.storage, '_save_messages', wraps=self.storage._save_messages) as mock_save:
+            sent = await self._run_check(
+                [self._role('a'), self._role('b')],
+                on_send=lambda role_key: mock_save.assert_not_called()
+            )
+        
+        self.assertEqual(sent, ['a', 'b'])
+        mock_save.assert_called_once()
+        reloaded = FileStorage(data_file=self.storage.data_file, messages_file=self.storage.messages_file)
+        self.assertEqual(reloaded.get_role_key_for_message('msg-a'), 'a')
+        self.assertEqual(reloaded.get_role_key_for_message('msg-b'), 'b')
+    
+    async def test_saves_new_listings(self):
+        """Test that the full listings are saved as the new previous data."""
+        new_data = [self._role('fresh'), self._role('old', days_ago=30)]
+        
+        with patch.object(self.storage, 'save_data', wraps=self.storage.save_data) as mock_save_data:
+            await self._run_check(new_data)
+        
+        mock_save_data.assert_called_once_with(new_data)
+        self.assertEqual(set(self.storage.get_roles_by_id()), {'fresh', 'old'})
+
+
+class TestBotEventHandlers(unittest.IsolatedAsyncioTestCase):
+    """Test cases for Discord bot event handlers."""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Set up the environment shared by all tests in the class."""
+        cls.env_patcher = patch.dict(os.environ, {
             'DISCORD_TOKEN': 'test-token',
             'CHANNEL_IDS': '123456789',
             'ENABLE_REACTIONS': 'true'
         })
-        self.env_patcher.start()
-        
-        from chatd.config import Config
+        cls.env_patcher.start()
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Restore the environment."""
+        cls.env_patcher.stop()
+    
+    def setUp(self):
+        """Set up test environment."""
         Config._instance = None
         
         # Clear global bot state
-        from chatd import bot
         bot.failed_channels.clear()
         bot.channel_failure_counts.clear()
+        bot.failed_channel_times.clear()
     
     def tearDown(self):
         """Clean up after tests."""
-        self.env_patcher.stop()
-        from chatd.config import Config
         Config._instance = None
         
         # Clear global bot state
-        from chatd import bot
         bot.failed_channels.clear()
         bot.channel_failure_counts.clear()
+        bot.failed_channel_times.clear()
     
     async def test_on_reaction_add_valid_reaction(self):
         """Test reaction event handler with valid reaction."""
-        from chatd.bot import on_reaction_add
-        
         # Mock Discord objects
         mock_user = MagicMock(spec=discord.Member)
         mock_user.id = 67890  # Different from bot ID
@@ -344,6 +591,26 @@ class TestBotEventHandlers(unittest.IsolatedAsyncioTestCase):
                     
                     mock_send_dm.assert_called_once_with(mock_user, role_data)
     
+    async def test_on_reaction_add_other_emoji(self):
+        """Test that reactions other than the bot's own are ignored."""
+        mock_user = MagicMock(spec=discord.Member)
+        mock_user.id = 67890
+        
+        mock_reaction = MagicMock()
+        mock_reaction.emoji = '👍'
+        mock_reaction.message.author.id = 98765
+        
+        with patch('chatd.bot.bot') as mock_bot, \
+             patch('chatd.bot.config') as mock_config:
+            
+            mock_config.enable_reactions = True
+            mock_bot.user.id = 98765
+            
+            with patch('chatd.bot.get_role_data_by_message_id') as mock_get_role_data:
+                await on_reaction_add(mock_reaction, mock_user)
+                
+                mock_get_role_data.assert_not_called()
+    
     @patch.dict(os.environ, {
         'DISCORD_TOKEN': 'test-token',
         'CHANNEL_IDS': '123456789',
@@ -351,9 +618,6 @@ class TestBotEventHandlers(unittest.IsolatedAsyncioTestCase):
     })
     async def test_on_reaction_add_reactions_disabled(self):
         """Test reaction handler when reactions are disabled."""
-        from chatd.config import Config
-        from chatd.bot import on_reaction_add
-        
         # Reset config
         Config._instance = None
         
@@ -368,8 +632,6 @@ class TestBotEventHandlers(unittest.IsolatedAsyncioTestCase):
     
     async def test_on_reaction_add_bot_reaction(self):
         """Test reaction handler ignoring bot's own reactions."""
-        from chatd.bot import on_reaction_add
-        
         mock_user = MagicMock()
         mock_user.id = 98765  # Same as bot ID
         
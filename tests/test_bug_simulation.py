@@ -22,53 +22,48 @@ class TestDirectoryPathBugFix(unittest.TestCase):
         """
         Simulate the bug where dirname() was incorrectly used on local_repo_path.
         """
-        # Create a temporary directory for testing
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Set up environment variables for testing
-            with patch.dict(os.environ, {
-                'LOCAL_REPO_PATH': temp_dir,
-                'DATA_FILE': os.path.join(temp_dir, 'data.json'),
-                'MESSAGES_FILE': os.path.join(temp_dir, 'messages.json'),
-                'CURRENT_HEAD_FILE': os.path.join(temp_dir, 'head.txt'),
-                'LOG_FILE': os.path.join(temp_dir, 'log.txt'),
-                'DISCORD_TOKEN': 'test-token',
-                'CHANNEL_IDS': '123456789,987654321'
-            }):
-                # Reset Config singleton
-                Config._instance = None
-                
-                # Create config instance
-                config = Config()
-                
-                # Manually create the buggy list with dirname() used incorrectly
-                buggy_dirs = [
-                    os.path.dirname(config.data_file),
-                    os.path.dirname(config.messages_file),
-                    os.path.dirname(config.current_head_file),
-                    os.path.dirname(config.log_file),
-                    os.path.dirname(config.local_repo_path),  # BUG: dirname shouldn't be used here
-                ]
-                
-                # Correct list without the bug
-                fixed_dirs = [
-                    os.path.dirname(config.data_file),
-                    os.path.dirname(config.messages_file),
-                    os.path.dirname(config.current_head_file),
-                    os.path.dirname(config.log_file),
-                    config.local_repo_path,  # FIXED: no dirname() call
-                ]
-                
-                # The buggy implementation should have a different path for local_repo_path
-                self.assertNotEqual(buggy_dirs[-1], fixed_dirs[-1], 
-                                   "Bug simulation failed - paths should differ")
-                
-                # The buggy implementation should have an empty path if root directory was used
-                with patch.dict(os.environ, {'LOCAL_REPO_PATH': '/'}):
-                    Config._instance = None
-                    root_config = Config()
-                    buggy_path = os.path.dirname(root_config.local_repo_path)
-                    self.assertEqual(buggy_path, '/', 
-                                    "Bug with root path should produce '/' (not empty string)")
+        # Only path strings are compared, so the directories don't need to exist
+        repo_dir = '/tmp/chatd-test-repo'
+        settings = {
+            'LOCAL_REPO_PATH': repo_dir,
+            'DATA_FILE': os.path.join(repo_dir, 'data.json'),
+            'MESSAGES_FILE': os.path.join(repo_dir, 'messages.json'),
+            'CURRENT_HEAD_FILE': os.path.join(repo_dir, 'head.txt'),
+            'LOG_FILE': os.path.join(repo_dir, 'log.txt'),
+            'DISCORD_TOKEN': 'test-token',
+            'CHANNEL_IDS': '123456789,987654321'
+        }
+        
+        # Create config instance
+        config = Config._from_mapping(settings)
+        
+        # Manually create the buggy list with dirname() used incorrectly
+        buggy_dirs = [
+            os.path.dirname(config.data_file),
+            os.path.dirname(config.messages_file),
+            os.path.dirname(config.current_head_file),
+            os.path.dirname(config.log_file),
+            os.path.dirname(config.local_repo_path),  # BUG: dirname shouldn't be used here
+        ]
+        
+        # Correct list without the bug
+        fixed_dirs = [
+            os.path.dirname(config.data_file),
+            os.path.dirname(config.messages_file),
+            os.path.dirname(config.current_head_file),
+            os.path.dirname(config.log_file),
+            config.local_repo_path,  # FIXED: no dirname() call
+        ]
+        
+        # The buggy implementation should have a different path for local_repo_path
+        self.assertNotEqual(buggy_dirs[-1], fixed_dirs[-1], 
+                           "Bug simulation failed - paths should differ")
+        
+        # The buggy implementation should have an empty path if root directory was used
+        root_config = Config._from_mapping({**settings, 'LOCAL_REPO_PATH': '/'})
+        buggy_path = os.path.dirname(root_config.local_repo_path)
+        self.assertEqual(buggy_path, '/', 
+                        "Bug with root path should produce '/' (not empty string)")
     
     def test_check_directory_writable(self):
         """Test the _check_directory_writable method for proper error handling."""
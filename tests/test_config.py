@@ -12,22 +12,26 @@ from chatd.config import Config, validate_config
 class TestConfig(unittest.TestCase):
     """Test cases for the Config class."""
     
-    def setUp(self):
-        """Set up the test environment."""
-        # Clear the singleton instance
-        Config._instance = None
-        
+    @classmethod
+    def setUpClass(cls):
+        """Set up the environment shared by all tests in the class."""
         # Mock environment variables
-        self.env_patcher = patch.dict(os.environ, {
+        cls.env_patcher = patch.dict(os.environ, {
             'DISCORD_TOKEN': 'test-token',
             'CHANNEL_IDS': '123456789,987654321',
             'LOG_LEVEL': 'DEBUG',
         })
-        self.env_patcher.start()
+        cls.env_patcher.start()
     
-    def tearDown(self):
-        """Clean up after the test."""
-        self.env_patcher.stop()
+    @classmethod
+    def tearDownClass(cls):
+        """Restore the environment."""
+        cls.env_patcher.stop()
+    
+    def setUp(self):
+        """Set up the test environment."""
+        # Clear the singleton instance
+        Config._instance = None
     
     def test_singleton(self):
         """Test that Config is a singleton."""
@@ -44,9 +48,26 @@ class TestConfig(unittest.TestCase):
             self.assertEqual(config.repo_url, 'https://github.com/SimplifyJobs/Summer2026-Internships.git')
             self.assertEqual(config.local_repo_path, '/tmp/test-repo')  # Now matches the mocked environment variable
             self.assertEqual(config.max_retries, 3)
+            self.assertEqual(config.send_concurrency, 8)
+            self.assertEqual(config.failed_channel_retry_minutes, 30)
             self.assertEqual(config.check_interval_minutes, 1)
             self.assertEqual(config.enable_reactions, False)  # Test default reaction setting
     
+    def test_from_mapping(self):
+        """Test building a standalone configuration from a mapping."""
+        config = Config._from_mapping({
+            'DISCORD_TOKEN': 'mapping-token',
+            'CHANNEL_IDS': '111, 222',
+            'LOCAL_REPO_PATH': '/tmp/mapping-repo',
+            'MAX_RETRIES': '',
+        })
+        
+        self.assertEqual(config.discord_token, 'mapping-token')
+        self.assertEqual(config.channel_ids, ['111', '222'])
+        self.assertEqual(config.local_repo_path, '/tmp/mapping-repo')
+        self.assertEqual(config.max_retries, 3)  # Empty values fall back to defaults
+        self.assertIsNot(config, Config())
+    
     def test_environment_values(self):
         """Test environment variable configuration values."""
         config = Config()
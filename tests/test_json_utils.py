@@ -0,0 +1,66 @@
+"""
+Tests for JSON serialization helpers.
+"""
+
+import json
+import unittest
+from unittest.mock import patch
+
+from chatd.json_utils import json_dumps, json_loads
+
+
+class TestJsonDumps(unittest.TestCase):
+    """Test cases for json_dumps."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.sample_data = [
+            {
+                'id': 'abc-123',
+                'company_name': 'Tëst Company',
+                'locations': ['New York', 'Remote'],
+                'active': True,
+                'date_posted': 1700000000
+            }
+        ]
+
+    def test_returns_bytes(self):
+        """Test that the encoded document is returned as bytes."""
+        payload = json_dumps(self.sample_data)
+
+        self.assertIsInstance(payload, bytes)
+        self.assertEqual(json.loads(payload), self.sample_data)
+
+    @patch('chatd.json_utils.orjson', None)
+    def test_stdlib_fallback(self):
+        """Test encoding when orjson is not installed."""
+        payload = json_dumps(self.sample_data)
+
+        self.assertIsInstance(payload, bytes)
+        self.assertEqual(json.loads(payload.decode('utf-8')), self.sample_data)
+
+
+class TestJsonLoads(unittest.TestCase):
+    """Test cases for json_loads."""
+
+    def test_loads_bytes(self):
+        """Test parsing a document read from a binary file."""
+        data = json_loads(b'[{"id": "abc-123", "active": true}]')
+
+        self.assertEqual(data, [{'id': 'abc-123', 'active': True}])
+
+    @patch('chatd.json_utils.orjson', None)
+    def test_stdlib_fallback(self):
+        """Test parsing when orjson is not installed."""
+        data = json_loads(b'{"abc-123": [{"message_id": "1"}]}')
+
+        self.assertEqual(data, {'abc-123': [{'message_id': '1'}]})
+
+    def test_invalid_document(self):
+        """Test that invalid JSON raises a ValueError."""
+        with self.assertRaises(ValueError):
+            json_loads(b'invalid json content')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -59,6 +59,54 @@ class TestFileStorage(unittest.TestCase):
         
         self.assertEqual(loaded_data, self.sample_data)
     
+    def test_load_data_uses_cache(self):
+        """Test that unchanged data is not re-read from disk."""
+        self.storage.save_data(self.sample_data)
+        
+        with patch('chatd.storage.json_loads') as mock_loads:
+            loaded_data = self.storage.load_data()
+            loaded_again = self.storage.load_data()
+        
+        mock_loads.assert_not_called()
+        self.assertEqual(loaded_data, self.sample_data)
+        self.assertIs(loaded_again, loaded_data)
+    
+    def test_load_data_detects_external_change(self):
+        """Test that the cache is refreshed when the file changes on disk."""
+        self.storage.save_data(self.sample_data)
+        self.storage.load_data()
+        
+        new_data = [{'id': 'changed', 'company_name': 'Other Company'}]
+        with open(self.data_file, 'w') as f:
+            json.dump(new_data, f)
+        
+        self.assertEqual(self.storage.load_data(), new_data)
+    
+    def test_get_role_by_id(self):
+        """Test looking up a stored role by ID."""
+        data = [
+            {'id': 'role1', 'company_name': 'Company A'},
+            {'id': 'role2', 'company_name': 'Company B'}
+        ]
+        self.storage.save_data(data)
+        
+        self.assertEqual(self.storage.get_role_by_id('role2'), data[1])
+        self.assertIsNone(self.storage.get_role_by_id('missing'))
+    
+    def test_get_role_by_id_after_save(self):
+        """Test that the ID index follows newly saved data."""
+        self.storage.save_data([{'id': 'role1'}])
+        self.assertIsNotNone(self.storage.get_role_by_id('role1'))
+        
+        self.storage.save_data([{'id': 'role2'}])
+        
+        self.assertIsNone(self.storage.get_role_by_id('role1'))
+        self.assertEqual(self.storage.get_role_by_id('role2'), {'id': 'role2'})
+    
+    def test_get_role_by_id_no_file(self):
+        """Test looking up a role when the data file doesn't exist."""
+        self.assertIsNone(self.storage.get_role_by_id('role1'))
+    
     def test_load_data_no_file(self):
         """Test loading data when file doesn't exist."""
         loaded_data = self.storage.load_data()
@@ -109,6 +157,97 @@ class TestFileStorage(unittest.TestCase):
         self.assertIn('role1', tracking_data)
         self.assertIn('role2', tracking_data)
     
+    def test_save_message_info_many(self):
+        """Test saving several messages with a single write."""
+        entries = [
+            ('12345', '67890', 'role1'),
+            ('54321', '09876', 'role1'),
+            ('99999', '11111', 'role2')
+        ]
+        
+        with patch.object(self.storage, '_save_messages', wraps=self.storage._save_messages) as mock_save:
+            result = self.storage.save_message_info_many(entries)
+        
+        self.assertTrue(result)
+        mock_save.assert_called_once()
+        with open(self.messages_file, 'r') as f:
+            tracking_data = json.load(f)
+        self.assertEqual(len(tracking_data['role1']), 2)
+        self.assertEqual(tracking_data['role2'][0]['message_id'], '99999')
+    
+    def test_buffered_defers_message_writes(self):
+        """Test that message info is written once when the buffer exits."""
+        with patch.object(self.storage, '_save_messages', return_value=True) as mock_save:
+            with self.storage.buffered():
+                self.assertTrue(self.storage.save_message_info('12345', '67890', 'role1'))
+                self.assertTrue(self.storage.save_message_info('54321', '09876', 'role2'))
+                mock_save.assert_not_called()
+            
+            mock_save.assert_called_once()
+        
+        # Buffered entries are visible immediately
+        self.assertEqual(len(self.storage.get_messages_for_role('role1')), 1)
+    
+    def test_buffered_nested_flushes_once(self):
+        """Test that only the outermost buffered block flushes."""
+        with self.storage.buffered():
+            with self.storage.buffered():
+                self.storage.save_message_info('12345', '67890', 'role1')
+            self.assertFalse(os.path.exists(self.messages_file))
+        
+        with open(self.messages_file, 'r') as f:
+            tracking_data = json.load(f)
+        self.assertIn('role1', tracking_data)
+    
+    def test_buffered_without_flush_defers_to_caller(self):
+        """Test that buffered(flush=False) leaves the write to an explicit flush()."""
+        with self.storage.buffered(flush=False):
+            self.storage.save_message_info('12345', '67890', 'role1')
+        self.assertFalse(os.path.exists(self.messages_file))
+        
+        self.assertTrue(self.storage.flush())
+        with open(self.messages_file, 'r') as f:
+            tracking_data = json.load(f)
+        self.assertIn('role1', tracking_data)
+    
+    def test_flush_keeps_entries_added_during_write(self):
+        """Test that entries buffered while a flush is writing are flushed later."""
+        save_messages = self.storage._save_messages
+        
+        def save_and_buffer_more():
+            # Simulate another check adding an entry after the write started
+            result = save_messages()
+            with self.storage.buffered(flush=False):
+                self.storage.save_message_info('54321', '09876', 'role2')
+            return result
+        
+        with self.storage.buffered(flush=False):
+            self.storage.save_message_info('12345', '67890', 'role1')
+        
+        with patch.object(self.storage, '_save_messages', side_effect=save_and_buffer_more):
+            self.assertTrue(self.storage.flush())
+        
+        self.assertTrue(self.storage.flush())
+        with open(self.messages_file, 'r') as f:
+            tracking_data = json.load(f)
+        self.assertIn('role2', tracking_data)
+    
+    def test_flush_failure_keeps_entries_buffered(self):
+        """Test that a failed flush is retried by the next one."""
+        with self.storage.buffered(flush=False):
+            self.storage.save_message_info('12345', '67890', 'role1')
+        
+        with patch.object(self.storage, '_save_messages', return_value=False):
+            self.assertFalse(self.storage.flush())
+        
+        self.assertTrue(self.storage.flush())
+        self.assertTrue(os.path.exists(self.messages_file))
+    
+    def test_flush_without_changes(self):
+        """Test that flushing with nothing buffered does not write."""
+        self.assertTrue(self.storage.flush())
+        self.assertFalse(os.path.exists(self.messages_file))
+    
     def test_get_messages_for_role(self):
         """Test retrieving messages for a specific role."""
         # Save multiple messages
@@ -137,6 +276,69 @@ class TestFileStorage(unittest.TestCase):
         
         self.assertEqual(messages, [])
     
+    def test_get_role_key_for_message(self):
+        """Test looking up the role key a message was posted for."""
+        self.storage.save_message_info('12345', '67890', 'role1')
+        self.storage.save_message_info_many([('54321', '09876', 'role2')])
+        
+        self.assertEqual(self.storage.get_role_key_for_message('12345'), 'role1')
+        self.assertEqual(self.storage.get_role_key_for_message('54321'), 'role2')
+        self.assertIsNone(self.storage.get_role_key_for_message('99999'))
+    
+    def test_get_role_key_for_message_after_reload(self):
+        """Test that the message index is rebuilt from the messages file."""
+        self.storage.save_message_info('12345', '67890', 'role1')
+        
+        reloaded = FileStorage(data_file=self.data_file, messages_file=self.messages_file)
+        
+        self.assertEqual(reloaded.get_role_key_for_message('12345'), 'role1')
+    
+    def test_get_role_key_for_message_legacy_format(self):
+        """Test that a messages file with single dict entries still loads."""
+        with open(self.messages_file, 'w') as f:
+            json.dump({
+                'role1': {'message_id': '12345', 'channel_id': '67890'},
+                'role2': [{'message_id': '54321', 'channel_id': '09876'}, 'bogus'],
+            }, f)
+        
+        reloaded = FileStorage(data_file=self.data_file, messages_file=self.messages_file)
+        
+        self.assertEqual(reloaded.get_role_key_for_message('12345'), 'role1')
+        self.assertEqual(reloaded.get_role_key_for_message('54321'), 'role2')
+    
+    def test_save_data_replaces_file_atomically(self):
+        """Test that saving replaces the file without leaving a temp file."""
+        self.storage.save_data([{'id': 'old'}])
+        
+        result = self.storage.save_data(self.sample_data)
+        
+        self.assertTrue(result)
+        self.assertFalse(os.path.exists(self.data_file + '.tmp'))
+        with open(self.data_file, 'r') as f:
+            self.assertEqual(json.load(f), self.sample_data)
+    
+    def test_save_data_failed_replace_keeps_original(self):
+        """Test that a failed save leaves the previous file intact."""
+        self.storage.save_data([{'id': 'old'}])
+        
+        with patch('chatd.storage.os.replace', side_effect=OSError()):
+            result = self.storage.save_data(self.sample_data)
+        
+        self.assertFalse(result)
+        with open(self.data_file, 'r') as f:
+            self.assertEqual(json.load(f), [{'id': 'old'}])
+        self.assertFalse(os.path.exists(f"{self.data_file}.tmp"))
+    
+    def test_write_locks_are_per_file(self):
+        """Test that the data and messages files are written under separate locks."""
+        data_lock = self.storage._write_locks[self.data_file]
+        
+        # Holding the data file lock must not block a messages write
+        with data_lock:
+            self.assertTrue(self.storage.save_message_info('12345', '67890', 'role1'))
+        
+        self.assertIsNot(data_lock, self.storage._write_locks[self.messages_file])
+    
     @patch('builtins.open', side_effect=PermissionError())
     def test_save_data_permission_error(self, mock_open):
         """Test data saving with permission error."""